@@ -1,32 +1,124 @@
 #---------------------------------------
 # Welcome to Alter Life RPG
 #---------------------------------------
+# Pure Python + Tkinter, so it also runs on PyPy3 (whose JIT helps with
+# large habit/quest lists). orjson is optional and only used if installed.
 
 #!/usr/bin/env python3
 
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import atexit
+import functools
 import json
+import mmap
 import os
-from datetime import datetime, date
-from typing import Dict, List
+import time
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Tuple
 import math
 
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+# Display name and color for each stat
+_STAT_INFO = {
+    "strength": ("💪 Strength", "#e74c3c"),
+    "intelligence": ("🧠 Intelligence", "#3498db"),
+    "charisma": ("💬 Charisma", "#9b59b6"),
+    "vitality": ("❤️ Vitality", "#2ecc71"),
+    "discipline": ("🎯 Discipline", "#f39c12")
+}
+
+# Star rating shown for each quest difficulty
+_DIFFICULTY_EMOJI = {"easy": "⭐", "normal": "⭐⭐", "hard": "⭐⭐⭐"}
+
+# (label, stat) choices offered by the habit and quest dialogs
+_STAT_CHOICES = tuple((name, stat) for stat, (name, _) in _STAT_INFO.items())
+# The "None" choice maps straight to a missing stat reward
+_QUEST_STAT_CHOICES = (("None", None),) + _STAT_CHOICES
+_STAT_LABEL_TO_VALUE = dict(_QUEST_STAT_CHOICES)
+
+# Widget options shared by the habit and quest dialogs
+_DIALOG_BG = "#1a1a2e"
+_LABEL_KW = {"bg": _DIALOG_BG, "fg": "white"}
+_RADIO_KW = {**_LABEL_KW, "selectcolor": "#0f3460"}
+_CREATE_BUTTON_KW = {"bg": "#e94560", "fg": "white", "font": ("Arial", 10, "bold")}
+_CANCEL_BUTTON_KW = {"bg": "#555", "fg": "white", "font": ("Arial", 10)}
+
+# XP per habit difficulty, and (XP, gold) per quest difficulty
+_HABIT_XP_REWARDS = {"easy": 10, "medium": 20, "hard": 30}
+_QUEST_REWARDS = {"easy": (30, 10), "normal": (50, 20), "hard": (100, 40)}
+
+
+# Today's ISO date and the timestamp (next local midnight) when it expires
+_today_cache = ["", 0.0]
+
+
+def today_str() -> str:
+    """Returns today's date as YYYY-MM-DD, recomputed at most once per day"""
+    if time.time() >= _today_cache[1]:
+        today = date.today()
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        _today_cache[0] = today.isoformat()
+        _today_cache[1] = midnight.timestamp()
+    return _today_cache[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _xp_for_level(level: int) -> int:
+    """XP needed to go from level to level + 1 (cached per level)"""
+    return int(100 * (level ** 1.5))
+
+
+def json_dumps(data, pretty: bool = False) -> bytes:
+    """Serializes data to UTF-8 JSON bytes (compact unless pretty)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(raw: bytes):
+    """Parses UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class LifeRPG:
     # Main Life RPG game class
     
+    # Save files larger than this are parsed straight from a memory map
+    MMAP_THRESHOLD = 64 * 1024
+    
+    # Set to True to write an indented, human-readable save file
+    PRETTY_SAVE = False
+    
     def __init__(self):
         self.data_file = "life_rpg_data.json"
         self.player = self.load_data()
+        self._dirty = False
+        
+        # Never lose pending changes, even if the window is not closed cleanly
+        atexit.register(self.flush)
         
     def load_data(self) -> Dict:
         """Loads player data"""
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.data_file, 'rb') as f:
+                    # orjson can parse a mapped file without copying it into bytes first
+                    if orjson is not None and os.fstat(f.fileno()).st_size > self.MMAP_THRESHOLD:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                return orjson.loads(view)
+                    return json_loads(f.read())
             except:
                 return self.create_new_player()
         return self.create_new_player()
@@ -49,28 +141,44 @@ class LifeRPG:
             "quests": [],
             "achievements": [],
             "gold": 0,
-            "last_login": str(date.today())
+            "last_login": today_str()
         }
     
     def save_data(self):
-        """Saves player data"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.player, f, indent=2, ensure_ascii=False)
+        """Saves player data atomically (write to a temp file, then rename)"""
+        tmp_file = self.data_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(self.player, self.PRETTY_SAVE))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.data_file)
+    
+    def mark_dirty(self):
+        """Flags player data as changed since the last save"""
+        self._dirty = True
+    
+    def flush(self):
+        """Saves player data if there are unsaved changes"""
+        if self._dirty:
+            self.save_data()
+            self._dirty = False
     
     def get_xp_for_next_level(self) -> int:
         """Calculates XP needed for next level"""
-        level = self.player["level"]
-        return int(100 * (level ** 1.5))
+        return _xp_for_level(self.player["level"])
     
-    def add_xp(self, amount: int):
-        """Adds experience to the player"""
+    def add_xp(self, amount: int) -> Tuple[bool, int]:
+        """Adds experience to the player, returns (leveled_up, new_level)"""
         self.player["xp"] += amount
         self.player["total_xp"] += amount
         
-        # Check for level up
-        xp_needed = self.get_xp_for_next_level()
-        if self.player["xp"] >= xp_needed:
+        # Check for level up (a big reward can be worth several levels)
+        leveled_up = False
+        while self.player["xp"] >= self.get_xp_for_next_level():
             self.level_up()
+            leveled_up = True
+        
+        return leveled_up, self.player["level"]
     
     def level_up(self):
         """Levels up the player"""
@@ -88,98 +196,73 @@ class LifeRPG:
         """Adds points to a stat"""
         if stat in self.player["stats"]:
             self.player["stats"][stat] += amount
-            self.save_data()
+            self.mark_dirty()
 
 
+@dataclass(slots=True)
 class Habit:
     """Class to represent a habit"""
     
-    def __init__(self, name: str, stat: str, xp_reward: int, difficulty: str = "medium"):
-        self.name = name
-        self.stat = stat
-        self.xp_reward = xp_reward
-        self.difficulty = difficulty
-        self.streak = 0
-        self.total_completions = 0
-        self.last_completed = None
-        self.created_date = str(date.today())
+    name: str
+    stat: str
+    xp_reward: int
+    difficulty: str = "medium"
+    streak: int = 0
+    total_completions: int = 0
+    last_completed: Optional[str] = None
+    created_date: str = field(default_factory=today_str)
     
     def to_dict(self) -> Dict:
         """Converts habit to dictionary"""
-        return {
-            "name": self.name,
-            "stat": self.stat,
-            "xp_reward": self.xp_reward,
-            "difficulty": self.difficulty,
-            "streak": self.streak,
-            "total_completions": self.total_completions,
-            "last_completed": self.last_completed,
-            "created_date": self.created_date
-        }
+        return asdict(self)
     
     @staticmethod
     def from_dict(data: Dict):
         """Creates a habit from a dictionary"""
-        habit = Habit(data["name"], data["stat"], data["xp_reward"], data["difficulty"])
-        habit.streak = data.get("streak", 0)
-        habit.total_completions = data.get("total_completions", 0)
-        habit.last_completed = data.get("last_completed")
-        habit.created_date = data.get("created_date", str(date.today()))
-        return habit
+        return Habit(**{k: data[k] for k in Habit.__dataclass_fields__ if k in data})
 
 
+@dataclass(slots=True)
 class Quest:
     """Class to represent a quest"""
     
-    def __init__(self, name: str, description: str, xp_reward: int, gold_reward: int, 
-                 stat_reward: str = None, difficulty: str = "normal"):
-        self.name = name
-        self.description = description
-        self.xp_reward = xp_reward
-        self.gold_reward = gold_reward
-        self.stat_reward = stat_reward
-        self.difficulty = difficulty
-        self.completed = False
-        self.created_date = str(date.today())
+    name: str
+    description: str
+    xp_reward: int
+    gold_reward: int
+    stat_reward: Optional[str] = None
+    difficulty: str = "normal"
+    completed: bool = False
+    created_date: str = field(default_factory=today_str)
     
     def to_dict(self) -> Dict:
         """Converts quest to dictionary"""
-        return {
-            "name": self.name,
-            "description": self.description,
-            "xp_reward": self.xp_reward,
-            "gold_reward": self.gold_reward,
-            "stat_reward": self.stat_reward,
-            "difficulty": self.difficulty,
-            "completed": self.completed,
-            "created_date": self.created_date
-        }
+        return asdict(self)
     
     @staticmethod
     def from_dict(data: Dict):
         """Creates a quest from a dictionary"""
-        quest = Quest(
-            data["name"], 
-            data["description"], 
-            data["xp_reward"],
-            data["gold_reward"],
-            data.get("stat_reward"),
-            data.get("difficulty", "normal")
-        )
-        quest.completed = data.get("completed", False)
-        quest.created_date = data.get("created_date", str(date.today()))
-        return quest
+        return Quest(**{k: data[k] for k in Quest.__dataclass_fields__ if k in data})
 
 
 class LifeRPGGUI:
     """Life RPG graphical interface"""
     
+    # Delay used to coalesce quick successive changes into a single save
+    SAVE_DELAY_MS = 500
+    
+    # Notebook tab indices
+    STATS_TAB, HABITS_TAB, QUESTS_TAB, ACHIEVEMENTS_TAB = range(4)
+    
     def __init__(self):
         self.game = LifeRPG()
         self.root = tk.Tk()
         self.root.title("Life RPG - Turn your life into a game!")
         self.root.geometry("900x700")
         self.root.configure(bg="#1a1a2e")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._save_job = None
+        self._styles_done = False
         
         # Styles
         self.setup_styles()
@@ -191,7 +274,11 @@ class LifeRPGGUI:
         self.update_display()
     
     def setup_styles(self):
-        """Sets up interface styles"""
+        """Sets up interface styles (only once per window)"""
+        if self._styles_done:
+            return
+        self._styles_done = True
+        
         style = ttk.Style()
         style.theme_use('clam')
         
@@ -231,6 +318,12 @@ class LifeRPGGUI:
         
         style.map("Custom.TButton",
                  background=[("active", "#d63447")])
+        
+        style.configure("Custom.Treeview",
+                       background=bg_medium,
+                       fieldbackground=bg_medium,
+                       foreground=text_color,
+                       font=("Arial", 10))
     
     def create_widgets(self):
         """Creates all interface widgets"""
@@ -249,17 +342,37 @@ class LifeRPGGUI:
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        # Stats tab
-        self.create_stats_tab()
+        # Tabs start as empty frames; their content is built the first time they are shown
+        self._tabs = [
+            ("📊 Stats", self.create_stats_tab, self.update_stats),
+            ("✅ Habits", self.create_habits_tab, self.update_habits_list),
+            ("⚔️ Quests", self.create_quests_tab, self.update_quests_list),
+            ("🏆 Achievements", self.create_achievements_tab, self.update_achievements)
+        ]
+        self._tab_frames = []
+        self._tab_built = [False] * len(self._tabs)
         
-        # Habits tab
-        self.create_habits_tab()
+        for text, _, _ in self._tabs:
+            frame = tk.Frame(self.notebook, bg="#1a1a2e")
+            self.notebook.add(frame, text=text)
+            self._tab_frames.append(frame)
         
-        # Quests tab
-        self.create_quests_tab()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.build_tab(self.STATS_TAB)
+    
+    def on_tab_changed(self, event):
+        """Builds the selected tab if it has not been shown yet"""
+        self.build_tab(self.notebook.index(self.notebook.select()))
+    
+    def build_tab(self, index: int):
+        """Creates and fills a tab's widgets on first use"""
+        if self._tab_built[index]:
+            return
         
-        # Achievements tab
-        self.create_achievements_tab()
+        _, create, update = self._tabs[index]
+        create(self._tab_frames[index])
+        self._tab_built[index] = True
+        update()
     
     def create_player_info_frame(self, parent):
         """Creates the player info frame"""
@@ -290,11 +403,8 @@ class LifeRPGGUI:
         self.xp_bar = ttk.Progressbar(xp_frame, mode='determinate', length=400)
         self.xp_bar.pack(pady=5)
     
-    def create_stats_tab(self):
+    def create_stats_tab(self, stats_frame):
         """Creates the stats tab"""
-        stats_frame = tk.Frame(self.notebook, bg="#1a1a2e")
-        self.notebook.add(stats_frame, text="📊 Stats")
-        
         # Title
         title = ttk.Label(stats_frame, text="Character Attributes", style="Header.TLabel")
         title.pack(pady=10)
@@ -306,15 +416,7 @@ class LifeRPGGUI:
         self.stat_labels = {}
         self.stat_bars = {}
         
-        stat_info = {
-            "strength": ("💪 Strength", "#e74c3c"),
-            "intelligence": ("🧠 Intelligence", "#3498db"),
-            "charisma": ("💬 Charisma", "#9b59b6"),
-            "vitality": ("❤️ Vitality", "#2ecc71"),
-            "discipline": ("🎯 Discipline", "#f39c12")
-        }
-        
-        for stat, (name, color) in stat_info.items():
+        for stat, (name, color) in _STAT_INFO.items():
             stat_container = tk.Frame(self.stats_frame, bg="#0f3460", relief=tk.RAISED, borderwidth=2)
             stat_container.pack(fill=tk.X, pady=5)
             
@@ -329,11 +431,8 @@ class LifeRPGGUI:
             bar.pack(padx=10, pady=(0, 5))
             self.stat_bars[stat] = bar
     
-    def create_habits_tab(self):
+    def create_habits_tab(self, habits_frame):
         """Creates the habits tab"""
-        habits_frame = tk.Frame(self.notebook, bg="#1a1a2e")
-        self.notebook.add(habits_frame, text="✅ Habits")
-        
         # Title and add button
         top_frame = tk.Frame(habits_frame, bg="#1a1a2e")
         top_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -345,10 +444,22 @@ class LifeRPGGUI:
                             command=self.add_habit, style="Custom.TButton")
         add_btn.pack(side=tk.RIGHT)
         
-        # Habits list
-        self.habits_listbox = tk.Listbox(habits_frame, bg="#16213e", fg="white", 
-                                         font=("Arial", 10), height=15, selectmode=tk.SINGLE)
-        self.habits_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        # Habits list (row ids are indices into the player's habit list)
+        list_frame = tk.Frame(habits_frame, bg="#1a1a2e")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.habits_tree = ttk.Treeview(list_frame, columns=("streak", "xp"), show="tree headings",
+                                        height=15, selectmode="browse", style="Custom.Treeview")
+        self.habits_tree.heading("#0", text="Habit")
+        self.habits_tree.heading("streak", text="Streak")
+        self.habits_tree.heading("xp", text="XP")
+        self.habits_tree.column("streak", width=100, anchor=tk.CENTER)
+        self.habits_tree.column("xp", width=80, anchor=tk.CENTER)
+        
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.habits_tree.yview)
+        self.habits_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.habits_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Action buttons
         btn_frame = tk.Frame(habits_frame, bg="#1a1a2e")
@@ -362,11 +473,8 @@ class LifeRPGGUI:
                                command=self.delete_habit, style="Custom.TButton")
         delete_btn.pack(side=tk.LEFT, padx=5)
     
-    def create_quests_tab(self):
+    def create_quests_tab(self, quests_frame):
         """Creates the quests tab"""
-        quests_frame = tk.Frame(self.notebook, bg="#1a1a2e")
-        self.notebook.add(quests_frame, text="⚔️ Quests")
-        
         # Title and add button
         top_frame = tk.Frame(quests_frame, bg="#1a1a2e")
         top_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -378,10 +486,25 @@ class LifeRPGGUI:
                             command=self.add_quest, style="Custom.TButton")
         add_btn.pack(side=tk.RIGHT)
         
-        # Quests list
-        self.quests_listbox = tk.Listbox(quests_frame, bg="#16213e", fg="white", 
-                                         font=("Arial", 10), height=15, selectmode=tk.SINGLE)
-        self.quests_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        # Quests list (row ids are indices into the player's quest list)
+        list_frame = tk.Frame(quests_frame, bg="#1a1a2e")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.quests_tree = ttk.Treeview(list_frame, columns=("difficulty", "xp", "gold"),
+                                        show="tree headings", height=15, selectmode="browse",
+                                        style="Custom.Treeview")
+        self.quests_tree.heading("#0", text="Quest")
+        self.quests_tree.heading("difficulty", text="Difficulty")
+        self.quests_tree.heading("xp", text="XP")
+        self.quests_tree.heading("gold", text="Gold")
+        self.quests_tree.column("difficulty", width=100, anchor=tk.CENTER)
+        self.quests_tree.column("xp", width=80, anchor=tk.CENTER)
+        self.quests_tree.column("gold", width=80, anchor=tk.CENTER)
+        
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.quests_tree.yview)
+        self.quests_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.quests_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Action buttons
         btn_frame = tk.Frame(quests_frame, bg="#1a1a2e")
@@ -395,11 +518,8 @@ class LifeRPGGUI:
                                command=self.delete_quest, style="Custom.TButton")
         delete_btn.pack(side=tk.LEFT, padx=5)
     
-    def create_achievements_tab(self):
+    def create_achievements_tab(self, achievements_frame):
         """Creates the achievements tab"""
-        achievements_frame = tk.Frame(self.notebook, bg="#1a1a2e")
-        self.notebook.add(achievements_frame, text="🏆 Achievements")
-        
         title = ttk.Label(achievements_frame, text="Unlocked Achievements", style="Header.TLabel")
         title.pack(pady=10)
         
@@ -413,6 +533,20 @@ class LifeRPGGUI:
     
     def update_display(self):
         """Updates all on-screen information"""
+        self.update_player_info()
+        self.update_stats()
+        
+        # Habits
+        self.update_habits_list()
+        
+        # Quests
+        self.update_quests_list()
+        
+        # Achievements
+        self.update_achievements()
+    
+    def update_player_info(self):
+        """Updates the player name, level, gold and XP bar"""
         player = self.game.player
         
         # Player info
@@ -425,49 +559,58 @@ class LifeRPGGUI:
         self.xp_label.config(text=f"XP: {player['xp']} / {xp_needed}")
         xp_percent = (player['xp'] / xp_needed) * 100
         self.xp_bar['value'] = xp_percent
+    
+    def update_stats(self):
+        """Updates the stat labels and bars"""
+        if not self._tab_built[self.STATS_TAB]:
+            return
         
-        # Stats
-        for stat, value in player['stats'].items():
+        for stat, value in self.game.player['stats'].items():
             self.stat_labels[stat].config(text=f"Level {value}")
             # Bars go from 0 to 50 (estimated max level)
             percent = min((value / 50) * 100, 100)
             self.stat_bars[stat]['value'] = percent
-        
-        # Habits
-        self.update_habits_list()
-        
-        # Quests
-        self.update_quests_list()
-        
-        # Achievements
-        self.update_achievements()
-        
-        # Check for new achievements
-        self.check_achievements()
+    
+    @staticmethod
+    def habit_values(habit: Dict) -> Tuple:
+        """Column values for a habit row"""
+        streak = habit.get("streak", 0)
+        return (f"{streak} 🔥" if streak > 0 else streak, habit["xp_reward"])
+    
+    @staticmethod
+    def quest_values(quest: Dict) -> Tuple:
+        """Column values for a quest row"""
+        difficulty_emoji = _DIFFICULTY_EMOJI.get(quest.get("difficulty"), "⭐⭐")
+        return (difficulty_emoji, quest["xp_reward"], quest["gold_reward"])
     
     def update_habits_list(self):
         """Updates the habits list"""
-        self.habits_listbox.delete(0, tk.END)
+        if not self._tab_built[self.HABITS_TAB]:
+            return
+        
+        self.habits_tree.delete(*self.habits_tree.get_children())
         
-        for habit_data in self.game.player.get("habits", []):
-            habit = Habit.from_dict(habit_data)
-            streak_emoji = "🔥" if habit.streak > 0 else ""
-            self.habits_listbox.insert(tk.END, 
-                f"{habit.name} | Streak: {habit.streak} {streak_emoji} | XP: {habit.xp_reward}")
+        for i, habit in enumerate(self.game.player.get("habits", [])):
+            self.habits_tree.insert("", tk.END, iid=str(i), text=habit["name"],
+                                    values=self.habit_values(habit))
     
     def update_quests_list(self):
         """Updates the quests list"""
-        self.quests_listbox.delete(0, tk.END)
+        if not self._tab_built[self.QUESTS_TAB]:
+            return
         
-        for quest_data in self.game.player.get("quests", []):
-            quest = Quest.from_dict(quest_data)
-            if not quest.completed:
-                difficulty_emoji = {"easy": "⭐", "normal": "⭐⭐", "hard": "⭐⭐⭐"}.get(quest.difficulty, "⭐⭐")
-                self.quests_listbox.insert(tk.END, 
-                    f"{difficulty_emoji} {quest.name} | XP: {quest.xp_reward} | Gold: {quest.gold_reward}")
+        self.quests_tree.delete(*self.quests_tree.get_children())
+        
+        for i, quest in enumerate(self.game.player.get("quests", [])):
+            if not quest.get("completed", False):
+                self.quests_tree.insert("", tk.END, iid=str(i), text=quest["name"],
+                                        values=self.quest_values(quest))
     
     def update_achievements(self):
         """Updates the achievements list"""
+        if not self._tab_built[self.ACHIEVEMENTS_TAB]:
+            return
+        
         self.achievements_text.config(state=tk.NORMAL)
         self.achievements_text.delete(1.0, tk.END)
         
@@ -488,30 +631,32 @@ class LifeRPGGUI:
         
         if dialog.result:
             habit = Habit(**dialog.result)
-            self.game.player.setdefault("habits", []).append(habit.to_dict())
-            self.game.save_data()
-            self.update_habits_list()
+            habits = self.game.player.setdefault("habits", [])
+            habits.append(habit.to_dict())
+            self.request_save()
+            self.habits_tree.insert("", tk.END, iid=str(len(habits) - 1), text=habit.name,
+                                    values=self.habit_values(habits[-1]))
             messagebox.showinfo("✅ Habit Created", f"Habit '{habit.name}' added!")
     
     def complete_habit(self):
         """Completes a selected habit"""
-        selection = self.habits_listbox.curselection()
+        selection = self.habits_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a habit")
             return
         
-        index = selection[0]
+        index = int(selection[0])
         habit_data = self.game.player["habits"][index]
         habit = Habit.from_dict(habit_data)
         
         # Check if already completed today
-        today = str(date.today())
+        today = today_str()
         if habit.last_completed == today:
             messagebox.showinfo("Info", "You already completed this habit today!")
             return
         
         # Update streak
-        yesterday = str(date.today().replace(day=date.today().day - 1))
+        yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
         if habit.last_completed == yesterday:
             habit.streak += 1
         else:
@@ -525,36 +670,41 @@ class LifeRPGGUI:
         gold_reward = habit.streak * 2
         
         # Add rewards
-        self.game.add_xp(xp_reward)
+        leveled_up, new_level = self.game.add_xp(xp_reward)
         self.game.add_stat(habit.stat, 1)
         self.game.player["gold"] += gold_reward
         
         # Save
-        self.game.player["habits"][index] = habit.to_dict()
-        self.game.save_data()
+        habit_data = habit.to_dict()
+        self.game.player["habits"][index] = habit_data
+        self.request_save()
         
-        # Check for level up
-        if self.game.player["xp"] >= self.game.get_xp_for_next_level():
-            if self.game.level_up():
-                messagebox.showinfo("🎉 LEVEL UP!", 
-                    f"Congratulations! You are now level {self.game.player['level']}!")
+        # Announce level up
+        if leveled_up:
+            messagebox.showinfo("🎉 LEVEL UP!", 
+                f"Congratulations! You are now level {new_level}!")
         
         messagebox.showinfo("✅ Habit Completed", 
             f"Excellent! +{xp_reward} XP, +{gold_reward} Gold, +1 {habit.stat.capitalize()}\nStreak: {habit.streak} days 🔥")
         
-        self.update_display()
+        # Only the player info, stats and this habit's row changed
+        self.update_player_info()
+        self.update_stats()
+        self.habits_tree.item(selection[0], values=self.habit_values(habit_data))
+        self.check_achievements()
     
     def delete_habit(self):
         """Deletes a selected habit"""
-        selection = self.habits_listbox.curselection()
+        selection = self.habits_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a habit")
             return
         
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this habit?"):
-            index = selection[0]
+            index = int(selection[0])
             del self.game.player["habits"][index]
-            self.game.save_data()
+            self.request_save()
+            # Later habits shift down, so their row ids must be rebuilt
             self.update_habits_list()
     
     def add_quest(self):
@@ -564,29 +714,21 @@ class LifeRPGGUI:
         
         if dialog.result:
             quest = Quest(**dialog.result)
-            self.game.player.setdefault("quests", []).append(quest.to_dict())
-            self.game.save_data()
-            self.update_quests_list()
+            quests = self.game.player.setdefault("quests", [])
+            quests.append(quest.to_dict())
+            self.request_save()
+            self.quests_tree.insert("", tk.END, iid=str(len(quests) - 1), text=quest.name,
+                                    values=self.quest_values(quests[-1]))
             messagebox.showinfo("✅ Quest Created", f"Quest '{quest.name}' added!")
     
     def complete_quest(self):
         """Completes a selected quest"""
-        selection = self.quests_listbox.curselection()
+        selection = self.quests_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a quest")
             return
         
-        index = selection[0]
-        # Find the real index (not counting completed ones)
-        real_index = 0
-        visible_index = 0
-        for i, quest_data in enumerate(self.game.player["quests"]):
-            quest = Quest.from_dict(quest_data)
-            if not quest.completed:
-                if visible_index == index:
-                    real_index = i
-                    break
-                visible_index += 1
+        real_index = int(selection[0])
         
         quest_data = self.game.player["quests"][real_index]
         quest = Quest.from_dict(quest_data)
@@ -595,7 +737,7 @@ class LifeRPGGUI:
         quest.completed = True
         
         # Add rewards
-        self.game.add_xp(quest.xp_reward)
+        leveled_up, new_level = self.game.add_xp(quest.xp_reward)
         self.game.player["gold"] += quest.gold_reward
         
         if quest.stat_reward:
@@ -603,84 +745,91 @@ class LifeRPGGUI:
         
         # Save
         self.game.player["quests"][real_index] = quest.to_dict()
-        self.game.save_data()
+        self.request_save()
         
-        # Check for level up
-        if self.game.player["xp"] >= self.game.get_xp_for_next_level():
-            if self.game.level_up():
-                messagebox.showinfo("🎉 LEVEL UP!", 
-                    f"Congratulations! You are now level {self.game.player['level']}!")
+        # Announce level up
+        if leveled_up:
+            messagebox.showinfo("🎉 LEVEL UP!", 
+                f"Congratulations! You are now level {new_level}!")
         
         stat_msg = f", +2 {quest.stat_reward.capitalize()}" if quest.stat_reward else ""
         messagebox.showinfo("⚔️ Quest Completed", 
             f"Quest '{quest.name}' completed!\n+{quest.xp_reward} XP, +{quest.gold_reward} Gold{stat_msg}")
         
-        self.update_display()
+        # Completed quests are hidden, so just drop this quest's row
+        self.update_player_info()
+        self.update_stats()
+        self.quests_tree.delete(selection[0])
+        self.check_achievements()
     
     def delete_quest(self):
         """Deletes a selected quest"""
-        selection = self.quests_listbox.curselection()
+        selection = self.quests_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a quest")
             return
         
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this quest?"):
-            index = selection[0]
-            # Find the real index
-            real_index = 0
-            visible_index = 0
-            for i, quest_data in enumerate(self.game.player["quests"]):
-                quest = Quest.from_dict(quest_data)
-                if not quest.completed:
-                    if visible_index == index:
-                        real_index = i
-                        break
-                    visible_index += 1
-            
-            del self.game.player["quests"][real_index]
-            self.game.save_data()
+            del self.game.player["quests"][int(selection[0])]
+            self.request_save()
+            # Later quests shift down, so their row ids must be rebuilt
             self.update_quests_list()
     
     def check_achievements(self):
-        """Checks and unlocks achievements"""
-        achievements = self.game.player.setdefault("achievements", [])
+        """Checks and unlocks achievements (call after XP, gold, streak or quest changes)"""
+        player = self.game.player
+        achievements = player.setdefault("achievements", [])
+        unlocked = set(achievements)
         new_achievements = []
         
         # Achievement: First quest
-        if len([q for q in self.game.player.get("quests", []) if Quest.from_dict(q).completed]) >= 1:
-            if "First Quest Completed" not in achievements:
+        if "First Quest Completed" not in unlocked:
+            if any(q.get("completed", False) for q in player.get("quests", [])):
                 new_achievements.append("First Quest Completed")
         
         # Achievement: Level 5
-        if self.game.player["level"] >= 5:
-            if "Reach Level 5" not in achievements:
-                new_achievements.append("Reach Level 5")
+        if player["level"] >= 5 and "Reach Level 5" not in unlocked:
+            new_achievements.append("Reach Level 5")
         
         # Achievement: Level 10
-        if self.game.player["level"] >= 10:
-            if "Reach Level 10" not in achievements:
-                new_achievements.append("Reach Level 10")
+        if player["level"] >= 10 and "Reach Level 10" not in unlocked:
+            new_achievements.append("Reach Level 10")
         
         # Achievement: 7 day streak
-        for habit_data in self.game.player.get("habits", []):
-            habit = Habit.from_dict(habit_data)
-            if habit.streak >= 7:
-                if "7 Day Streak" not in achievements:
-                    new_achievements.append("7 Day Streak")
-                break
+        if "7 Day Streak" not in unlocked:
+            if any(h.get("streak", 0) >= 7 for h in player.get("habits", [])):
+                new_achievements.append("7 Day Streak")
         
         # Achievement: 100 gold
-        if self.game.player["gold"] >= 100:
-            if "Accumulate 100 Gold" not in achievements:
-                new_achievements.append("Accumulate 100 Gold")
+        if player["gold"] >= 100 and "Accumulate 100 Gold" not in unlocked:
+            new_achievements.append("Accumulate 100 Gold")
         
         # Add new achievements
         if new_achievements:
             achievements.extend(new_achievements)
-            self.game.save_data()
+            self.request_save()
+            self.update_achievements()
             messagebox.showinfo("🏆 New Achievement!", 
                 f"You unlocked: {', '.join(new_achievements)}!")
     
+    def request_save(self):
+        """Schedules a save, batching changes made in quick succession"""
+        self.game.mark_dirty()
+        if self._save_job is None:
+            self._save_job = self.root.after(self.SAVE_DELAY_MS, self.flush_save)
+    
+    def flush_save(self):
+        """Writes pending changes to disk immediately"""
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+            self._save_job = None
+        self.game.flush()
+    
+    def on_close(self):
+        """Saves pending changes and closes the window"""
+        self.flush_save()
+        self.root.destroy()
+    
     def run(self):
         """Runs the application"""
         self.root.mainloop()
@@ -694,60 +843,56 @@ class HabitDialog:
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("New Habit")
         self.dialog.geometry("400x300")
-        self.dialog.configure(bg="#1a1a2e")
+        self.dialog.configure(bg=_DIALOG_BG)
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
         # Name
-        tk.Label(self.dialog, text="Habit Name:", bg="#1a1a2e", fg="white").pack(pady=5)
+        tk.Label(self.dialog, text="Habit Name:", **_LABEL_KW).pack(pady=5)
         self.name_entry = tk.Entry(self.dialog, width=30)
         self.name_entry.pack(pady=5)
         
         # Stat
-        tk.Label(self.dialog, text="Stat:", bg="#1a1a2e", fg="white").pack(pady=5)
-        self.stat_var = tk.StringVar(value="discipline")
-        stats = [
-            ("💪 Strength", "strength"),
-            ("🧠 Intelligence", "intelligence"),
-            ("💬 Charisma", "charisma"),
-            ("❤️ Vitality", "vitality"),
-            ("🎯 Discipline", "discipline")
-        ]
-        for text, value in stats:
-            tk.Radiobutton(self.dialog, text=text, variable=self.stat_var, value=value,
-                          bg="#1a1a2e", fg="white", selectcolor="#0f3460").pack(anchor=tk.W, padx=20)
+        tk.Label(self.dialog, text="Stat:", **_LABEL_KW).pack(pady=5)
+        self.stat_var = tk.StringVar(value=_STAT_INFO["discipline"][0])
+        ttk.Combobox(self.dialog, textvariable=self.stat_var, state="readonly",
+                     values=[text for text, _ in _STAT_CHOICES]).pack(pady=5)
         
         # Difficulty
-        tk.Label(self.dialog, text="Difficulty:", bg="#1a1a2e", fg="white").pack(pady=5)
+        tk.Label(self.dialog, text="Difficulty:", **_LABEL_KW).pack(pady=5)
         self.difficulty_var = tk.StringVar(value="medium")
         difficulties = [("Easy (10 XP)", "easy"), ("Medium (20 XP)", "medium"), ("Hard (30 XP)", "hard")]
         for text, value in difficulties:
             tk.Radiobutton(self.dialog, text=text, variable=self.difficulty_var, value=value,
-                          bg="#1a1a2e", fg="white", selectcolor="#0f3460").pack(anchor=tk.W, padx=20)
+                          **_RADIO_KW).pack(anchor=tk.W, padx=20)
+        
+        # Validation message (shown inline instead of a modal popup)
+        self._error_label = tk.Label(self.dialog, text="", fg="#e94560", bg=_DIALOG_BG)
+        self._error_label.pack()
         
         # Buttons
-        btn_frame = tk.Frame(self.dialog, bg="#1a1a2e")
+        btn_frame = tk.Frame(self.dialog, bg=_DIALOG_BG)
         btn_frame.pack(pady=20)
         
-        tk.Button(btn_frame, text="Create", command=self.create, bg="#e94560", fg="white",
-                 font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
-        tk.Button(btn_frame, text="Cancel", command=self.dialog.destroy, bg="#555", fg="white",
-                 font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Create", command=self.create,
+                 **_CREATE_BUTTON_KW).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Cancel", command=self.dialog.destroy,
+                 **_CANCEL_BUTTON_KW).pack(side=tk.LEFT, padx=5)
     
     def create(self):
         """Creates the habit"""
+        self._error_label.config(text="")
         name = self.name_entry.get().strip()
         if not name:
-            messagebox.showwarning("Warning", "Please enter a name")
+            self._error_label.config(text="Please enter a name")
             return
         
-        xp_rewards = {"easy": 10, "medium": 20, "hard": 30}
-        
+        difficulty = self.difficulty_var.get()
         self.result = {
             "name": name,
-            "stat": self.stat_var.get(),
-            "xp_reward": xp_rewards[self.difficulty_var.get()],
-            "difficulty": self.difficulty_var.get()
+            "stat": _STAT_LABEL_TO_VALUE[self.stat_var.get()],
+            "xp_reward": _HABIT_XP_REWARDS[difficulty],
+            "difficulty": difficulty
         }
         self.dialog.destroy()
 
@@ -760,22 +905,22 @@ class QuestDialog:
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("New Quest")
         self.dialog.geometry("450x400")
-        self.dialog.configure(bg="#1a1a2e")
+        self.dialog.configure(bg=_DIALOG_BG)
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
         # Name
-        tk.Label(self.dialog, text="Quest Name:", bg="#1a1a2e", fg="white").pack(pady=5)
+        tk.Label(self.dialog, text="Quest Name:", **_LABEL_KW).pack(pady=5)
         self.name_entry = tk.Entry(self.dialog, width=40)
         self.name_entry.pack(pady=5)
         
         # Description
-        tk.Label(self.dialog, text="Description:", bg="#1a1a2e", fg="white").pack(pady=5)
+        tk.Label(self.dialog, text="Description:", **_LABEL_KW).pack(pady=5)
         self.desc_entry = tk.Entry(self.dialog, width=40)
         self.desc_entry.pack(pady=5)
         
         # Difficulty
-        tk.Label(self.dialog, text="Difficulty:", bg="#1a1a2e", fg="white").pack(pady=5)
+        tk.Label(self.dialog, text="Difficulty:", **_LABEL_KW).pack(pady=5)
         self.difficulty_var = tk.StringVar(value="normal")
         difficulties = [
             ("⭐ Easy (30 XP, 10 Gold)", "easy"),
@@ -784,57 +929,47 @@ class QuestDialog:
         ]
         for text, value in difficulties:
             tk.Radiobutton(self.dialog, text=text, variable=self.difficulty_var, value=value,
-                          bg="#1a1a2e", fg="white", selectcolor="#0f3460").pack(anchor=tk.W, padx=20)
+                          **_RADIO_KW).pack(anchor=tk.W, padx=20)
         
         # Stat reward
-        tk.Label(self.dialog, text="Stat Bonus (optional):", bg="#1a1a2e", fg="white").pack(pady=5)
-        self.stat_var = tk.StringVar(value="none")
-        stats = [
-            ("None", "none"),
-            ("💪 Strength", "strength"),
-            ("🧠 Intelligence", "intelligence"),
-            ("💬 Charisma", "charisma"),
-            ("❤️ Vitality", "vitality"),
-            ("🎯 Discipline", "discipline")
-        ]
-        for text, value in stats:
-            tk.Radiobutton(self.dialog, text=text, variable=self.stat_var, value=value,
-                          bg="#1a1a2e", fg="white", selectcolor="#0f3460").pack(anchor=tk.W, padx=20)
+        tk.Label(self.dialog, text="Stat Bonus (optional):", **_LABEL_KW).pack(pady=5)
+        self.stat_var = tk.StringVar(value="None")
+        ttk.Combobox(self.dialog, textvariable=self.stat_var, state="readonly",
+                     values=[text for text, _ in _QUEST_STAT_CHOICES]).pack(pady=5)
+        
+        # Validation message (shown inline instead of a modal popup)
+        self._error_label = tk.Label(self.dialog, text="", fg="#e94560", bg=_DIALOG_BG)
+        self._error_label.pack()
         
         # Buttons
-        btn_frame = tk.Frame(self.dialog, bg="#1a1a2e")
+        btn_frame = tk.Frame(self.dialog, bg=_DIALOG_BG)
         btn_frame.pack(pady=20)
         
-        tk.Button(btn_frame, text="Create", command=self.create, bg="#e94560", fg="white",
-                 font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
-        tk.Button(btn_frame, text="Cancel", command=self.dialog.destroy, bg="#555", fg="white",
-                 font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Create", command=self.create,
+                 **_CREATE_BUTTON_KW).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Cancel", command=self.dialog.destroy,
+                 **_CANCEL_BUTTON_KW).pack(side=tk.LEFT, padx=5)
     
     def create(self):
         """Creates the quest"""
+        self._error_label.config(text="")
         name = self.name_entry.get().strip()
         description = self.desc_entry.get().strip()
         
         if not name:
-            messagebox.showwarning("Warning", "Please enter a name")
+            self._error_label.config(text="Please enter a name")
             return
         
-        rewards = {
-            "easy": (30, 10),
-            "normal": (50, 20),
-            "hard": (100, 40)
-        }
-        
-        xp, gold = rewards[self.difficulty_var.get()]
-        stat = self.stat_var.get() if self.stat_var.get() != "none" else None
+        difficulty = self.difficulty_var.get()
+        xp, gold = _QUEST_REWARDS[difficulty]
         
         self.result = {
             "name": name,
             "description": description or "An epic quest",
             "xp_reward": xp,
             "gold_reward": gold,
-            "stat_reward": stat,
-            "difficulty": self.difficulty_var.get()
+            "stat_reward": _STAT_LABEL_TO_VALUE[self.stat_var.get()],
+            "difficulty": difficulty
         }
         self.dialog.destroy()
 